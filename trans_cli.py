@@ -10,9 +10,26 @@ import feedparser
 import getpass
 import logging
 import urllib
-from transmission_rpc.error import TransmissionError
+import urllib.request
+import json
+import subprocess
+import threading
+import queue
+import re
+import random
+import collections
+import ctypes
+import ctypes.util
+import select
+import struct
+from transmission_rpc.error import TransmissionError, TransmissionConnectError
 from pytz import timezone
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
 ### TODO!
 
 # add 'stalled' option to peers and forcestart commands
@@ -26,8 +43,29 @@ TRANSMISSION_PASSWORD = ""  # Change if needed
 HISTORY_FILE = ".transmission_shell_history"
 RSS_FEED_FILE = "rss_feeds.txt"  # File containing RSS feed URLs
 SEEN_TORRENTS_FILE = ".rss_seen"  # Stores previously added torrents
+RSS_RULES_FILE = "rss_rules.txt"  # Per-feed include/exclude rules for RSS entries
 TIMEZONE_OFFSET = -8
 
+# Bandwidth auto-tuner bounds (bwauto). Speeds are in KB/s.
+BWAUTO_QUEUE_MIN = 2  # Smallest download-queue-size bwauto will set
+BWAUTO_QUEUE_MAX = 20  # Largest download-queue-size bwauto will set
+BWAUTO_ALT_SPEED_MAX = 5000  # Highest alt-speed-down bwauto will raise to
+BWAUTO_TORRENT_LIMIT_MAX = 10000  # Highest per-torrent download limit bwauto will raise to
+BWAUTO_SATURATION = 0.9  # Fraction of a limit at which it counts as saturated
+BWAUTO_STALL_MINUTES = 10  # Downloading at 0 KB/s this long counts as dead
+BWAUTO_TOLERANCE = 0.1  # Fractional drop in aggregate rate after a queue step that reverses direction
+
+# Watch-folder ingest (watchdir)
+WATCHDIR_SETTLE_SECONDS = 2  # A file must be unchanged this long before it is ingested
+WATCHDIR_POLL_INTERVAL = 5  # Seconds between scans when inotify is unavailable
+WATCHDIR_DONE = "done"  # Subfolder for successfully added .torrent files
+WATCHDIR_FAILED = "failed"  # Subfolder for .torrent files the daemon rejected
+
+# Shared poller and torrent events
+POLL_INTERVAL = 5  # Default seconds between torrent-get calls made by the shared poller
+POLL_STALL_MINUTES = 10  # Downloading at 0 KB/s this long raises a 'stalled' event
+HOOKS_FILE = "event_hooks.txt"  # Shell commands or webhooks to run on torrent events
+
 # Logging Configuration
 logging.basicConfig(
     filename="logs/transmission_shell.log",
@@ -124,11 +162,12 @@ def make_prog_bar(perc):
     
     return fill(perc) + blank(perc) + percent(perc)
 
-def list_torrents(client, status_filter=None, min_progress=0, max_progress=100):
+def list_torrents(client, status_filter=None, min_progress=0, max_progress=100, torrents=None):
     """pythonhosted.org/transmission/reference/transmissionrpc.html
     List all torrents with optional filters:
     - status_filter: Show only torrents with a specific status (e.g., 'downloading', 'seeding').
     - min_progress, max_progress: Show torrents within a progress range (0-100).
+    - torrents: Already-fetched torrents (e.g. a poller snapshot) to list instead of asking the server.
     """
     def fix_eta(eta):
         if eta == "not available":
@@ -136,7 +175,8 @@ def list_torrents(client, status_filter=None, min_progress=0, max_progress=100):
         return str(eta)
        
     try:
-        torrents = client.get_torrents()
+        if torrents is None:
+            torrents = client.get_torrents()
         if not torrents:
             print("No active torrents.")
             return
@@ -172,19 +212,176 @@ def list_torrents(client, status_filter=None, min_progress=0, max_progress=100):
         logging.error(f"Error fetching torrent list: {e}")
         print("Error: Unable to fetch torrents. Transmission may be down.")
     
-def watch_torrents(client, interval=5):
-    """Continuously monitor torrents and refresh status."""
+EVENT_ADDED = "added"
+EVENT_REMOVED = "removed"
+EVENT_COMPLETED = "completed"
+EVENT_STALLED = "stalled"
+EVENT_STATUS_CHANGED = "status_changed"
+EVENT_ERROR = "error"
+EVENT_TYPES = [EVENT_ADDED, EVENT_REMOVED, EVENT_COMPLETED, EVENT_STALLED, EVENT_STATUS_CHANGED, EVENT_ERROR]
+
+# `previous` is the torrent as it was in the last snapshot (None for 'added')
+TorrentEvent = collections.namedtuple("TorrentEvent", ["type", "torrent", "previous"])
+
+# Fields the poller fetches: enough for the event diff, list_torrents, bwauto and hook payloads
+POLL_FIELDS = ["id", "name", "status", "percentDone", "eta", "rateDownload", "activityDate",
+               "error", "errorString", "downloadLimit", "downloadLimited"]
+
+# The one torrent-get loop shared by watch, autoresume, bwauto and event hooks.
+# Subscribers are name -> (callback, interval); the poller runs at the shortest interval asked for.
+_poller = {"thread": None, "stop": None, "wake": None, "client": None,
+           "subscribers": {}, "lock": threading.Lock()}
+
+
+def diff_snapshots(old, new):
+    """Compare two {id: torrent} snapshots and return the TorrentEvents between them."""
+    events = []
+    for tid, t in new.items():
+        prev = old.get(tid)
+        if prev is None:
+            events.append(TorrentEvent(EVENT_ADDED, t, None))
+            continue
+        if prev.status != t.status:
+            events.append(TorrentEvent(EVENT_STATUS_CHANGED, t, prev))
+        if prev.progress < 100 <= t.progress:
+            events.append(TorrentEvent(EVENT_COMPLETED, t, prev))
+        if is_stalled(t, POLL_STALL_MINUTES) and not is_stalled(prev, POLL_STALL_MINUTES):
+            events.append(TorrentEvent(EVENT_STALLED, t, prev))
+        if t.error and (t.error != prev.error or t.error_string != prev.error_string):
+            events.append(TorrentEvent(EVENT_ERROR, t, prev))
+
+    for tid, prev in old.items():
+        if tid not in new:
+            events.append(TorrentEvent(EVENT_REMOVED, prev, prev))
+    return events
+
+
+def poll_torrents(client, stop, wake):
+    """
+    Poller thread: one torrent-get per interval, diffed against the last snapshot and published
+    to every subscriber as callback(events, snapshot, error). When a fetch fails, subscribers get
+    no events, the last good snapshot and the error.
+    Callbacks run on this thread, so they must hand work off rather than block.
+    """
+    previous = None
+    while not stop.is_set():
+        try:
+            snapshot = {t.id: t for t in client.get_torrents(arguments=POLL_FIELDS)}
+            error = None
+        except TransmissionError as e:
+            logging.error(f"Poller: error fetching torrents: {e}")
+            events, snapshot, error = [], previous or {}, e
+        else:
+            # The first snapshot is the baseline, so existing torrents don't all show up as 'added'
+            events = diff_snapshots(previous, snapshot) if previous is not None else []
+            previous = snapshot
+            for e in events:
+                logging.info(f"Event: {e.type} {e.torrent.name} (ID: {e.torrent.id})")
+
+        with _poller["lock"]:
+            subscribers = list(_poller["subscribers"].items())
+        for name, (callback, _interval) in subscribers:
+            try:
+                callback(events, snapshot, error)
+            except Exception as e:
+                logging.error(f"Poller: subscriber '{name}' failed: {e}")
+
+        with _poller["lock"]:
+            interval = min((i for _c, i in _poller["subscribers"].values()), default=POLL_INTERVAL)
+        wake.wait(interval)
+        wake.clear()
+
+
+def subscribe(client, name, callback, interval=POLL_INTERVAL):
+    """
+    Register callback(events, snapshot, error) to run after every poll, starting the shared poller if needed.
+    The poller runs at the shortest interval of all its subscribers, so a callback can be called
+    more often than its own `interval` and should throttle itself if that matters.
+    """
+    with _poller["lock"]:
+        _poller["subscribers"][name] = (callback, interval)
+        running = _poller["thread"] is not None and _poller["thread"].is_alive()
+        if running and _poller["client"] is client:
+            _poller["wake"].set()  # Poll now, then carry on at the (possibly shorter) new interval
+            return
+
+        if running:
+            _poller["stop"].set()  # Connected to a different server since the poller started
+            _poller["wake"].set()
+        _poller["client"] = client
+        _poller["stop"] = threading.Event()
+        _poller["wake"] = threading.Event()
+        _poller["thread"] = threading.Thread(target=poll_torrents, daemon=True,
+                                             args=(client, _poller["stop"], _poller["wake"]))
+        _poller["thread"].start()
+        logging.info(f"Poller started (every {interval} seconds).")
+
+
+def unsubscribe(name):
+    """Remove a subscriber, stopping the shared poller when nobody is left."""
+    with _poller["lock"]:
+        _poller["subscribers"].pop(name, None)
+        if not _poller["subscribers"] and _poller["stop"] is not None:
+            _poller["stop"].set()
+            _poller["wake"].set()
+            _poller["thread"] = None
+            logging.info("Poller stopped.")
+
+
+def stop_poller():
+    """Drop every subscriber and stop the shared poller (e.g. on disconnect)."""
+    with _poller["lock"]:
+        _poller["subscribers"].clear()
+        if _poller["stop"] is not None:
+            _poller["stop"].set()
+            _poller["wake"].set()
+        _poller["thread"] = None
+
+
+def consume_snapshots(client, name, interval, handler, stop_message):
+    """
+    Run handler(events, snapshot, error) on the calling thread for polls at least `interval`
+    seconds apart, until Ctrl+C. Events from the polls in between are carried over, and fetch
+    errors are passed on straight away. This keeps slow consumers off the poller thread.
+    """
+    inbox = queue.Queue()
+    state = {"last": 0, "events": []}
+
+    def deliver(events, snapshot, error):
+        state["events"] += events
+        if error is None:
+            if time.time() - state["last"] < interval:
+                return
+            state["last"] = time.time()
+        inbox.put((state["events"], snapshot, error))
+        state["events"] = []
+
+    subscribe(client, name, deliver, interval)
     try:
         while True:
-            os.system("clear" if os.name == "posix" else "cls")  # Clear screen for a clean refresh
-            print("Watching torrents (Press Ctrl+C to stop)...")
-            list_torrents(client)
-            time.sleep(interval)
-    except TransmissionError as e:
-        logging.error(f"Connection lost while watching torrents: {e}")
-        print("Error: Lost connection to Transmission.")
+            try:
+                events, snapshot, error = inbox.get(timeout=1)
+            except queue.Empty:
+                continue
+            handler(events, snapshot, error)
     except KeyboardInterrupt:
-        print("\nStopped watching torrents.")
+        print(f"\n{stop_message}")
+    finally:
+        unsubscribe(name)
+
+
+def watch_torrents(client, interval=5):
+    """Continuously monitor torrents, redrawing from the shared poller's snapshots."""
+    def redraw(events, snapshot, error):
+        os.system("clear" if os.name == "posix" else "cls")  # Clear screen for a clean refresh
+        print("Watching torrents (Press Ctrl+C to stop)...")
+        if error is not None:
+            print("Error: Lost connection to Transmission. Showing the last known status.")
+        list_torrents(client, torrents=list(snapshot.values()))
+        for e in events:
+            print(f"[{e.type}] {e.torrent.name} (ID: {e.torrent.id})")
+
+    consume_snapshots(client, "watch", interval, redraw, "Stopped watching torrents.")
 
 def add_torrent(client, url, download_dir=None, paused=False):
     """Add a torrent by URL with an optional download directory."""
@@ -212,12 +409,173 @@ def add_torrents_from_directory(client, directory, download_dir=None,paused=Fals
     for torrent_file in torrent_files:
         file_path = os.path.join(directory, torrent_file)
         try:
-            client.add_torrent(f"file://{file_path}", download_dir=download_dir,paused=paused)
+            add_torrent_file(client, file_path, download_dir, paused)
             print(f"Added {torrent_file}")
-        except TransmissionError as e:
+        except (TransmissionError, OSError) as e:
             logging.error(f"Error adding torrent {torrent_file}: {e}")
             print(f"Error: Unable to add {torrent_file}. Transmission may be unresponsive.")
 
+def add_torrent_file(client, file_path, download_dir=None, paused=False):
+    """Upload a local .torrent file's contents, so the daemon doesn't need access to our filesystem."""
+    with open(file_path, "rb") as f:
+        metainfo = f.read()
+    return client.add_torrent(metainfo, download_dir=download_dir, paused=paused)
+
+def open_inotify(directory):
+    """
+    Return a non-blocking inotify fd watching `directory` for finished files,
+    or None if inotify isn't available (non-Linux, or the call fails).
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError) as e:
+        logging.warning(f"inotify unavailable: {e}")
+        return None
+
+def read_inotify_events(fd):
+    """
+    Drain pending inotify events. Returns (file names, overflowed).
+    If the kernel queue overflowed, events were lost and the caller should rescan.
+    """
+    IN_Q_OVERFLOW = 0x00004000
+    names, overflowed = [], False
+    try:
+        data = os.read(fd, 64 * 1024)
+    except BlockingIOError:
+        return names, overflowed
+
+    offset = 0
+    while offset < len(data):
+        _wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+        offset += struct.calcsize("iIII")
+        name = data[offset:offset + length].rstrip(b"\0")
+        offset += length
+        if mask & IN_Q_OVERFLOW:
+            overflowed = True
+        elif name:
+            names.append(os.fsdecode(name))
+    return names, overflowed
+
+def move_to_subfolder(file_path, subfolder):
+    """Move an ingested file into a subfolder next to it, without overwriting an earlier file of the same name."""
+    target_dir = os.path.join(os.path.dirname(file_path), subfolder)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, os.path.basename(file_path))
+    if os.path.exists(target):
+        stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        target = f"{target[:-len('.torrent')]}.{stamp}.torrent"
+    os.replace(file_path, target)
+    return target
+
+def ingest_torrent_file(client, file_path, download_dir=None, paused=False):
+    """
+    Add one dropped .torrent file and move it to the done or failed subfolder.
+    Returns False if the daemon couldn't be reached, so the file should be retried later;
+    otherwise the file is finished with, even if it couldn't be moved.
+    """
+    torrent_file = os.path.basename(file_path)
+    try:
+        add_torrent_file(client, file_path, download_dir, paused)
+    except TransmissionConnectError as e:
+        logging.error(f"watchdir: Transmission unreachable, will retry {torrent_file}: {e}")
+        print(f"Error: Unable to reach Transmission, will retry {torrent_file}.")
+        return False
+    except (TransmissionError, OSError) as e:
+        logging.error(f"watchdir: Error adding torrent {torrent_file}: {e}")
+        print(f"Failed: {torrent_file}")
+        subfolder = WATCHDIR_FAILED
+    else:
+        logging.info(f"watchdir: Added {torrent_file}")
+        print(f"Added {torrent_file}")
+        subfolder = WATCHDIR_DONE
+
+    try:
+        move_to_subfolder(file_path, subfolder)
+    except OSError as e:
+        # The file is dropped from the watch list either way, so it won't be added again
+        logging.error(f"watchdir: Unable to move {torrent_file} to {subfolder}/: {e}")
+        print(f"Error: Unable to move {torrent_file} to {subfolder}/.")
+    return True
+
+def watch_torrent_directory(client, directory, download_dir=None, paused=False):
+    """
+    Watch a drop folder and add new .torrent files as they land.
+    - Uses Linux inotify, falling back to polling every WATCHDIR_POLL_INTERVAL seconds.
+    - A file is only ingested once it has been unchanged for WATCHDIR_SETTLE_SECONDS.
+    - Ingested files are moved to the WATCHDIR_DONE or WATCHDIR_FAILED subfolder.
+    """
+    if not os.path.isdir(directory):
+        logging.error(f"Error watching directory. {directory} does not exist")
+        print(f"Error: {directory} does not exist.")
+        return
+
+    def scan():
+        return [f for f in os.listdir(directory) if f.endswith(".torrent")]
+
+    fd = open_inotify(directory)
+    mode = "inotify" if fd is not None else f"polling every {WATCHDIR_POLL_INTERVAL}s"
+    logging.info(f"watchdir: Watching {directory} ({mode})")
+    print(f"Watching {directory} for new .torrent files ({mode})... Press Ctrl+C to stop.")
+
+    pending = {}  # file name -> (size, mtime) at the last check
+    for name in scan():  # Pick up anything dropped while we weren't watching
+        pending[name] = None
+
+    try:
+        while True:
+            if fd is not None:
+                timeout = 1 if pending else None
+                ready, _, _ = select.select([fd], [], [], timeout)
+                if ready:
+                    names, overflowed = read_inotify_events(fd)
+                    if overflowed:
+                        logging.warning("watchdir: inotify queue overflowed, rescanning")
+                        names = scan()
+                    for name in names:
+                        if name.endswith(".torrent"):
+                            pending.setdefault(name, None)
+            else:
+                time.sleep(1 if pending else WATCHDIR_POLL_INTERVAL)
+                for name in scan():
+                    pending.setdefault(name, None)
+
+            now = time.time()
+            for name in list(pending):
+                file_path = os.path.join(directory, name)
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    del pending[name]
+                    continue
+
+                # Debounce: wait until the file stops changing before reading it
+                current = (st.st_size, st.st_mtime)
+                if pending[name] != current or now - st.st_mtime < WATCHDIR_SETTLE_SECONDS:
+                    pending[name] = current
+                    continue
+
+                if not ingest_torrent_file(client, file_path, download_dir, paused):
+                    time.sleep(WATCHDIR_POLL_INTERVAL)  # Daemon unreachable; back off before retrying
+                    break
+                del pending[name]
+    except KeyboardInterrupt:
+        print("\nStopped watching directory.")
+    finally:
+        if fd is not None:
+            os.close(fd)
+
 def add_torrents_from_file(client,file,directory=False,paused=False):
     """Add torrents from a file containing a list of magnet links."""
 
@@ -380,6 +738,303 @@ def save_seen_torrent(magnet_link):
         f.write(magnet_link + "\n")
 
 
+# Compiled RSS rules, rebuilt only when RSS_RULES_FILE changes on disk.
+# `skipped` holds links the current rules rejected, so each entry is only evaluated and counted once.
+_rss_rules_cache = {"mtime": None, "rules": [], "matchers": {}, "skipped": set()}
+
+
+def parse_size(text):
+    """Convert a size such as '700M' or '4.5G' into bytes."""
+    units = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    match = re.fullmatch(r"([\d.]+)\s*([KMGT]?)I?B?", text.strip().upper())
+    if not match:
+        raise ValueError(f"invalid size '{text}'")
+    return int(float(match.group(1)) * units[match.group(2)])
+
+
+def load_rss_rules():
+    """
+    Load include/exclude rules from RSS_RULES_FILE, one per line:
+        <feed url|*> <include|exclude> <title|category|size> <pattern>
+    - title: case-insensitive keyword, or 're:<regex>' for a regular expression.
+    - category: case-insensitive category/tag name.
+    - size: comparison such as '>4G' or '<=700M'.
+    Invalid lines are logged and skipped.
+    """
+    rules = []
+    if not os.path.exists(RSS_RULES_FILE):
+        return rules
+
+    with open(RSS_RULES_FILE, "r") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            parts = line.split(None, 3)
+            if len(parts) < 4 or parts[1] not in ("include", "exclude") or parts[2] not in ("title", "category", "size"):
+                logging.warning(f"{RSS_RULES_FILE}:{line_no}: invalid rule '{line}'")
+                continue
+
+            feed, action, field, pattern = parts
+            rule = {"line": line_no, "text": line, "feed": feed, "action": action,
+                    "field": field, "pattern": pattern, "hits": 0}
+            try:
+                if field == "size":
+                    op, value = re.fullmatch(r"(<=|>=|<|>|=)?\s*(.+)", pattern).groups()
+                    rule["op"] = op or "="
+                    rule["value"] = parse_size(value)
+                elif field == "title" and pattern.startswith("re:"):
+                    re.compile(pattern[3:])
+            except (ValueError, re.error) as e:
+                logging.warning(f"{RSS_RULES_FILE}:{line_no}: invalid rule '{line}': {e}")
+                continue
+            rules.append(rule)
+
+    logging.info(f"Loaded {len(rules)} RSS rules from {RSS_RULES_FILE}")
+    return rules
+
+
+def fold_case(text):
+    """
+    Case-fold text for keyword matching. Dotless and dotted i are folded to a plain 'i' as well,
+    so a literal found this way is never missed where re.IGNORECASE would have matched.
+    """
+    return text.casefold().translate({0x131: "i", 0x307: None})
+
+
+def required_literal(pattern):
+    """
+    The longest run of literal characters that every match of `pattern` must contain, case-folded,
+    or "" if the pattern has no usable one (e.g. an alternation at the top level).
+    Used to prefilter regex rules through the keyword automaton.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return ""
+
+    best, run = "", ""
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            run += chr(av)
+        else:
+            best, run = max(best, run, key=len), ""
+    best = fold_case(max(best, run, key=len))
+    return best if len(best) >= 2 else ""
+
+
+def build_keyword_automaton(keywords):
+    """
+    Build an Aho-Corasick automaton from (keyword, rule_index) pairs.
+    Returns (goto, fail, out) tables indexed by state.
+    """
+    goto, fail, out = [{}], [0], [[]]
+    for word, rule_index in keywords:
+        state = 0
+        for ch in word:
+            if ch not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                out.append([])
+                goto[state][ch] = len(goto) - 1
+            state = goto[state][ch]
+        out[state].append(rule_index)
+
+    # Breadth-first pass to fill in failure links; depth-1 states fail to the root
+    queue = collections.deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            queue.append(nxt)
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0)
+            out[nxt] = out[nxt] + out[fail[nxt]]
+
+    return goto, fail, out
+
+
+def search_keywords(automaton, text):
+    """Return the rule indexes of every keyword found in text, in a single pass."""
+    goto, fail, out = automaton
+    state = 0
+    found = set()
+    for ch in text:
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        found.update(out[state])
+    return found
+
+
+def compile_rss_rules(rules, feed_url):
+    """
+    Compile the rules that apply to feed_url (its own rules plus '*' rules) into one matcher:
+    an Aho-Corasick automaton for title keywords, a lookup table for categories and a short
+    list of size comparisons. Each title regex adds the literal it requires to the automaton,
+    so one pass over the title finds both keyword matches and the few regexes worth running;
+    only regexes without such a literal are searched on every entry.
+    """
+    keywords, regexes, unfiltered, categories, sizes = [], {}, [], {}, []
+    has_include = False
+
+    for index, rule in enumerate(rules):
+        if rule["feed"] not in ("*", feed_url):
+            continue
+        has_include = has_include or rule["action"] == "include"
+
+        if rule["field"] == "title" and rule["pattern"].startswith("re:"):
+            regexes[index] = re.compile(rule["pattern"][3:], re.IGNORECASE)
+            literal = required_literal(rule["pattern"][3:])
+            if literal:
+                keywords.append((literal, index))
+            else:
+                unfiltered.append(index)
+        elif rule["field"] == "title":
+            keywords.append((fold_case(rule["pattern"]), index))
+        elif rule["field"] == "category":
+            categories.setdefault(rule["pattern"].lower(), []).append(index)
+        else:
+            sizes.append(index)
+
+    return {
+        "rules": rules,
+        "has_include": has_include,
+        "keywords": build_keyword_automaton(keywords) if keywords else None,
+        "regexes": regexes,
+        "unfiltered_regexes": unfiltered,
+        "categories": categories,
+        "sizes": sizes,
+    }
+
+
+def get_rss_matcher(feed_url):
+    """Return the compiled matcher for a feed, recompiling only when the rules file has changed."""
+    mtime = os.path.getmtime(RSS_RULES_FILE) if os.path.exists(RSS_RULES_FILE) else None
+    if mtime != _rss_rules_cache["mtime"]:
+        _rss_rules_cache["mtime"] = mtime
+        _rss_rules_cache["rules"] = load_rss_rules()
+        _rss_rules_cache["matchers"] = {}
+        _rss_rules_cache["skipped"] = set()  # New rules may accept entries the old ones skipped
+
+    if feed_url not in _rss_rules_cache["matchers"]:
+        _rss_rules_cache["matchers"][feed_url] = compile_rss_rules(_rss_rules_cache["rules"], feed_url)
+    return _rss_rules_cache["matchers"][feed_url]
+
+
+def get_entry_size(entry):
+    """Best-effort size of an RSS entry in bytes, or None if the feed doesn't say."""
+    for enclosure in entry.get("enclosures", []):
+        if str(enclosure.get("length", "")).isdigit() and int(enclosure["length"]) > 0:
+            return int(enclosure["length"])
+    for key in ("contentlength", "torrent_contentlength", "size"):
+        if str(entry.get(key, "")).isdigit():
+            return int(entry[key])
+    return None
+
+
+def match_rss_entry(matcher, entry):
+    """
+    Evaluate one feed entry against a compiled matcher.
+    Returns (accepted, rule): any exclude match rejects the entry; if the feed has include
+    rules, one of them must match. `rule` is the deciding rule, or None if no rule decided.
+    Every matching rule has its hit count incremented.
+    """
+    rules = matcher["rules"]
+    matched = set()
+
+    title = entry.get("title", "")
+    regexes = matcher["regexes"]
+    candidates = set(matcher["unfiltered_regexes"])
+    if matcher["keywords"]:
+        for i in search_keywords(matcher["keywords"], fold_case(title)):
+            if i in regexes:
+                candidates.add(i)  # The regex's literal is present; confirm with the regex itself
+            else:
+                matched.add(i)
+    matched.update(i for i in candidates if regexes[i].search(title))
+
+    tags = [t.get("term", "") for t in entry.get("tags", [])] + [entry.get("category", "")]
+    for tag in tags:
+        matched.update(matcher["categories"].get(tag.lower(), []))
+
+    size = get_entry_size(entry) if matcher["sizes"] else None
+    if size is not None:
+        compare = {"<": size.__lt__, "<=": size.__le__, ">": size.__gt__, ">=": size.__ge__, "=": size.__eq__}
+        matched.update(i for i in matcher["sizes"] if compare[rules[i]["op"]](rules[i]["value"]))
+
+    for i in matched:
+        rules[i]["hits"] += 1
+
+    excludes = sorted(i for i in matched if rules[i]["action"] == "exclude")
+    if excludes:
+        return False, rules[excludes[0]]
+    includes = sorted(i for i in matched if rules[i]["action"] == "include")
+    if includes:
+        return True, rules[includes[0]]
+    return not matcher["has_include"], None
+
+
+def benchmark_rss_rules(rule_count=3000, entry_count=100):
+    """
+    Time the compiled matcher against checking every rule one by one, on synthetic
+    keyword and regex rules, and check both give the same results.
+    """
+    rng = random.Random(0)
+    words = [f"{''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(6))}{i}" for i in range(rule_count)]
+    rules = []
+    for i, word in enumerate(words):
+        pattern = f"re:{word}\\d+" if i % 2 else word
+        rules.append({"line": i + 1, "text": pattern, "feed": "*", "action": "include",
+                      "field": "title", "pattern": pattern, "hits": 0})
+    titles = [" ".join(rng.choice(words) + str(rng.randint(0, 99)) if rng.random() < 0.2
+                       else "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(8))
+                       for _ in range(6)) for _ in range(entry_count)]
+
+    start = time.perf_counter()
+    matcher = compile_rss_rules(rules, "*")
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [match_rss_entry(matcher, {"title": t}) for t in titles]
+    compiled_time = time.perf_counter() - start
+
+    naive_regexes = {i: re.compile(r["pattern"][3:], re.IGNORECASE) for i, r in enumerate(rules) if r["pattern"].startswith("re:")}
+    start = time.perf_counter()
+    naive = []
+    for t in titles:
+        hits = [i for i, r in enumerate(rules)
+                if (naive_regexes[i].search(t) if i in naive_regexes else fold_case(r["pattern"]) in fold_case(t))]
+        naive.append((bool(hits), rules[hits[0]] if hits else None))
+    naive_time = time.perf_counter() - start
+
+    print(f"{rule_count} rules, {entry_count} entries:")
+    print(f"  compile once:    {compile_time:.3f}s")
+    print(f"  compiled match:  {compiled_time / entry_count * 1000:.3f} ms/entry")
+    print(f"  one-by-one:      {naive_time / entry_count * 1000:.3f} ms/entry")
+    print(f"  results match:   {'yes' if compiled == naive else 'NO'}")
+
+
+def describe_rss_rule(rule):
+    """Short description of a rule for output and logs."""
+    return f"{RSS_RULES_FILE}:{rule['line']} {rule['action']} {rule['field']} {rule['pattern']}"
+
+
+def show_rss_rule_hits():
+    """Print per-rule hit counts since the rules file was last loaded."""
+    get_rss_matcher("*")  # Make sure the rules are loaded and current
+    rules = _rss_rules_cache["rules"]
+    if not rules:
+        print(f"No RSS rules loaded. Add rules to '{RSS_RULES_FILE}'.")
+        return
+
+    print(f"\n=== RSS Rule Hits ===")
+    for rule in sorted(rules, key=lambda r: -r["hits"]):
+        print(f"{rule['hits']:>6} | {rule['feed']} | {describe_rss_rule(rule)}")
+
+
 def fetch_rss_torrents(client):
     """Fetch new torrents from RSS feeds and add only unseen ones."""
     rss_feeds = load_rss_feeds()
@@ -389,22 +1044,34 @@ def fetch_rss_torrents(client):
 
     seen_torrents = load_seen_torrents()
     new_torrents = 0
+    skipped_torrents = 0
 
     for feed_url in rss_feeds:
         print(f"Checking RSS feed: {feed_url}")
         feed = feedparser.parse(feed_url)
+        matcher = get_rss_matcher(feed_url)
         
         for entry in feed.entries:
             magnet_link = entry.link.strip()
             
-            if magnet_link in seen_torrents:
-                continue  # Skip already seen torrents
+            if magnet_link in seen_torrents or magnet_link in _rss_rules_cache["skipped"]:
+                continue  # Skip already seen torrents, and ones the current rules already rejected
+
+            accepted, rule = match_rss_entry(matcher, entry)
+            if not accepted:
+                reason = describe_rss_rule(rule) if rule else "no include rule matched"
+                logging.info(f"RSS entry skipped: {entry.title} ({reason})")
+                _rss_rules_cache["skipped"].add(magnet_link)
+                skipped_torrents += 1
+                continue
             
             client.add_torrent(magnet_link)
             save_seen_torrent(magnet_link)
             new_torrents += 1
-            print(f"Added: {entry.title}")
+            print(f"Added: {entry.title}" + (f" ({describe_rss_rule(rule)})" if rule else ""))
 
+    if skipped_torrents:
+        print(f"Skipped {skipped_torrents} entries by RSS rules (see log for details).")
     if new_torrents == 0:
         print("No new torrents found.")
     else:
@@ -456,24 +1123,253 @@ def auto_resume_stalled(client, interval=900, stall_threshold=10):
     - Resumes torrents that have been stalled for `stall_threshold` minutes.
     """
     print("Starting auto-resume for stalled torrents... Press Ctrl+C to stop.")
-    try:
-        while True:
-            stalled_torrents = get_stalled_torrents(client, stall_threshold)
-            
-            if not stalled_torrents:
-                print("No stalled torrents found.")
-            else:
-                for t in stalled_torrents:
-                    print(f"Restarting stalled torrent: {t.name} (ID: {t.id})")
+
+    def resume(events, snapshot, error):
+        # Stalled torrents come from the shared poller's snapshot, so this adds no torrent-get calls
+        if error is not None:
+            return  # Already logged by the poller; don't act on a stale snapshot
+        stalled_torrents = [t for t in snapshot.values() if is_stalled(t, stall_threshold)]
+
+        if not stalled_torrents:
+            print("No stalled torrents found.")
+        else:
+            for t in stalled_torrents:
+                print(f"Restarting stalled torrent: {t.name} (ID: {t.id})")
+                try:
                     client.stop_torrent(t.id)
                     time.sleep(2)
                     client.start_torrent(t.id)
+                except TransmissionError as e:
+                    logging.error(f"Error restarting stalled torrent {t.id}: {e}")
+                    print(f"Error restarting torrent {t.id}. Transmission may be unresponsive.")
+
+        print(f"Waiting {interval} seconds before next check...")
+
+    consume_snapshots(client, "autoresume", interval, resume, "Auto-resume stopped.")
+
+
+def load_event_hooks():
+    """
+    Load event hooks from HOOKS_FILE, one per line:
+        <event|*> <shell command or http(s):// URL>
+    """
+    hooks = []
+    if not os.path.exists(HOOKS_FILE):
+        return hooks
+
+    with open(HOOKS_FILE, "r") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split(None, 1)
+            if len(parts) < 2 or parts[0] not in EVENT_TYPES + ["*"]:
+                logging.warning(f"{HOOKS_FILE}:{line_no}: invalid hook '{line}'")
+                continue
+            hooks.append((parts[0], parts[1]))
+    return hooks
+
+
+def run_event_hook(target, event):
+    """
+    Run one hook for an event.
+    - URLs get the event POSTed as JSON.
+    - Anything else is run as a shell command with the event in TR_* environment variables.
+    """
+    t = event.torrent
+    payload = {
+        "event": event.type,
+        "id": t.id,
+        "name": t.name,
+        "status": t.status.value,
+        "previous_status": event.previous.status.value if event.previous else None,
+        "progress": t.progress,
+        "error": t.error_string,
+    }
+
+    if target.startswith(("http://", "https://")):
+        request = urllib.request.Request(target, data=json.dumps(payload).encode(),
+                                         headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=5).close()
+    else:
+        env = dict(os.environ, **{f"TR_{k.upper()}": str(v) for k, v in payload.items()})
+        subprocess.Popen(target, shell=True, env=env)
+
+
+# Hooks run on their own worker thread, so slow commands and webhooks never hold up the poller
+_hooks = {"jobs": None, "worker": None}
+
+
+def run_hook_worker(jobs):
+    """Hook worker thread: run queued (target, event) jobs one at a time until it receives None."""
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        target, e = job
+        try:
+            run_event_hook(target, e)
+            logging.info(f"Hook ran for {e.type} {e.torrent.name}: {target}")
+        except Exception as err:
+            # Any failure (bad URL, broken endpoint, ...) is logged; the worker must keep running
+            logging.error(f"Hook failed for {e.type} {e.torrent.name}: {target}: {err}")
+
+
+def start_event_hooks(client):
+    """Run the hooks in HOOKS_FILE in the background whenever the shared poller sees a matching event."""
+    hooks = load_event_hooks()
+    if not hooks:
+        print(f"No event hooks found. Add hooks to '{HOOKS_FILE}'.")
+        return
+
+    if _hooks["jobs"] is not None:
+        stop_event_hooks()  # Reload the hooks file
+    jobs = queue.Queue()
+    _hooks["jobs"] = jobs
+    _hooks["worker"] = threading.Thread(target=run_hook_worker, args=(jobs,), daemon=True)
+    _hooks["worker"].start()
+
+    def dispatch(events, snapshot, error):
+        for e in events:
+            for event_type, target in hooks:
+                if event_type in ("*", e.type):
+                    jobs.put((target, e))
+
+    subscribe(client, "hooks", dispatch)
+    print(f"Event hooks enabled ({len(hooks)} hooks).")
+
+
+def stop_event_hooks():
+    unsubscribe("hooks")
+    if _hooks["jobs"] is not None:
+        _hooks["jobs"].put(None)  # Let the worker finish what's queued, then exit
+        _hooks["jobs"] = None
+        _hooks["worker"] = None
+    print("Event hooks disabled.")
+
+
+def aggregate_rate(torrents):
+    """Aggregate download rate of the given torrents in KB/s."""
+    return sum(t.rate_download for t in torrents) / 1024
+
+
+def log_bw_change(message):
+    """Record a setting change made by bwauto."""
+    logging.info(f"bwauto: {message}")
+    print(f"[bwauto] {message}")
+
+
+def requeue_dead_torrents(client, session, torrents, state):
+    """
+    Give the download slots of dead (stalled) torrents to torrents waiting in the queue.
+    A dead torrent is stopped, moved to the bottom of the queue and started again, so it
+    waits behind the others. Each torrent is only requeued once until it comes back to life.
+    """
+    dead_ids = {t.id for t in torrents if is_stalled(t, BWAUTO_STALL_MINUTES)}
+    state["requeued"] &= dead_ids  # Forget torrents that have recovered, so they're handled again if they die
+
+    waiting = [t for t in torrents if t.status == "download pending"]
+    if not session.download_queue_enabled or not waiting:
+        return []
+
+    dead = [t for t in torrents if t.id in dead_ids - state["requeued"]]
+    if dead:
+        ids = [t.id for t in dead]
+        client.stop_torrent(ids)
+        client.queue_bottom(ids)
+        client.start_torrent(ids)
+        state["requeued"].update(ids)
+        for t in dead:
+            log_bw_change(f"requeued stalled torrent {t.name} (ID: {t.id}) behind {len(waiting)} waiting torrents")
+    return dead
+
+
+def tune_queue_size(client, session, total_rate, torrents, state):
+    """
+    Hill-climb download-queue-size within [BWAUTO_QUEUE_MIN, BWAUTO_QUEUE_MAX].
+    Each step is judged on the sample that follows it: the direction only reverses if
+    aggregate throughput dropped by more than BWAUTO_TOLERANCE. When a step is blocked (at a
+    bound, or nothing waiting to grow into) the direction reverses so the next pass probes the
+    other way. A disabled queue, or one the user set outside the bounds, is left alone.
+    """
+    if state["last_step"] is not None:
+        baseline, step = state["last_step"]
+        state["last_step"] = None
+        if total_rate < baseline * (1 - BWAUTO_TOLERANCE):
+            state["direction"] = -step
+
+    queue_size = session.download_queue_size
+    if not session.download_queue_enabled or not BWAUTO_QUEUE_MIN <= queue_size <= BWAUTO_QUEUE_MAX:
+        return
+
+    # Growing the queue is pointless when nothing is waiting for a slot
+    waiting = [t for t in torrents if t.status == "download pending"]
+    new_size = queue_size + state["direction"]
+    if not BWAUTO_QUEUE_MIN <= new_size <= BWAUTO_QUEUE_MAX or (state["direction"] > 0 and not waiting):
+        state["direction"] = -state["direction"]
+        return
+
+    client.set_session(download_queue_size=new_size)
+    state["last_step"] = (total_rate, state["direction"])
+    log_bw_change(f"download-queue-size {queue_size} -> {new_size} (aggregate {total_rate:.1f} KB/s)")
+
+
+def tune_alt_speed(client, session, total_rate):
+    """Raise alt-speed-down while alt-speed is on and saturated, up to BWAUTO_ALT_SPEED_MAX."""
+    if not session.alt_speed_enabled:
+        return
+
+    current = session.alt_speed_down
+    if current < BWAUTO_ALT_SPEED_MAX and total_rate >= current * BWAUTO_SATURATION:
+        new_limit = min(BWAUTO_ALT_SPEED_MAX, max(int(current * 1.5), current + 1))
+        client.set_session(alt_speed_down=new_limit)
+        log_bw_change(f"alt-speed-down {current} -> {new_limit} KB/s (aggregate {total_rate:.1f} KB/s)")
+
+
+def tune_torrent_limits(client, torrents):
+    """Raise saturated per-torrent download limits, up to BWAUTO_TORRENT_LIMIT_MAX."""
+    for t in torrents:
+        if t.status != "downloading" or not t.download_limited:
+            continue
+
+        current = t.download_limit
+        if 0 < current < BWAUTO_TORRENT_LIMIT_MAX and t.rate_download / 1024 >= current * BWAUTO_SATURATION:
+            new_limit = min(BWAUTO_TORRENT_LIMIT_MAX, current * 2)
+            client.change_torrent(t.id, download_limit=new_limit)
+            log_bw_change(f"download limit for {t.name} (ID: {t.id}) {current} -> {new_limit} KB/s")
+
+
+def auto_tune_bandwidth(client, interval=60):
+    """
+    Periodically sample throughput and tune queue size, alt-speed and per-torrent limits.
+    - Runs every `interval` seconds (default: 1 minute).
+    - Only raises limits up to the BWAUTO_* bounds, never lowers a user's setting, and logs every change.
+    """
+    print("Starting bandwidth auto-tuning... Press Ctrl+C to stop.")
+    state = {"last_step": None, "direction": 1, "requeued": set()}
+
+    def tune(events, snapshot, error):
+        # Rates come from the shared poller's snapshot, so this adds no torrent-get calls
+        if error is not None:
+            return  # Already logged by the poller; don't tune on a stale snapshot
+        torrents = list(snapshot.values())
+        total_rate = aggregate_rate(torrents)
+        try:
+            session = client.get_session()
+            print(f"Aggregate download rate: {total_rate:.1f} KB/s across {len(torrents)} torrents")
+
+            requeue_dead_torrents(client, session, torrents, state)
+            tune_queue_size(client, session, total_rate, torrents, state)
+            tune_alt_speed(client, session, total_rate)
+            tune_torrent_limits(client, torrents)
+        except TransmissionError as e:
+            logging.error(f"bwauto: error while tuning bandwidth: {e}")
+            print("Error: Unable to tune bandwidth. Transmission may be unresponsive.")
+
+        print(f"Waiting {interval} seconds before next sample...")
+
+    consume_snapshots(client, "bwauto", interval, tune, "Bandwidth auto-tuning stopped.")
 
-            print(f"Waiting {interval} seconds before next check...")
-            time.sleep(interval)
-    except KeyboardInterrupt:
-        print("\nAuto-resume stopped.")
-        
 def get_server_info(client):
     torrents = len(client.get_torrents())
     print(f"No. of Torrents: {torrents}")
@@ -535,9 +1431,9 @@ def main():
         "list", "watch", "add", "adddir", "massadd", "remove", "removecompleted",
         "start", "forcestart", "stop", "startall", "forcestartall", "stopall", "peers", "porttest",
         "blocklist", "clear", "exit", "help", "rssfetch", "rssauto", "autoresume", "connect", "disconnect", 
-        "server-info", "exportmagnets"
+        "server-info", "exportmagnets", "bwauto", "rssrules", "watchdir", "hooks"
     ]
-    PATH_COMMANDS = ["adddir", "massadd","exportmagnets"]
+    PATH_COMMANDS = ["adddir", "massadd","exportmagnets", "watchdir"]
     
     def file_completer(text, state):
         """Tab completion for filenames and directories."""
@@ -592,19 +1488,34 @@ def main():
                 username = TRANSMISSION_USER if host == TRANSMISSION_HOST else input("Username: ")
                 password = TRANSMISSION_PASSWORD if host == TRANSMISSION_HOST else getpass.getpass("Password: ")
 
+                if _hooks["jobs"] is not None:
+                    stop_event_hooks()  # Hooks were subscribed with the old connection
+                stop_poller()
                 client = connect_to_transmission(host, username, password)
                 if client:
                     get_server_info(client)
                     list_torrents(client)
                 
             elif cmd == "disconnect":
+                if _hooks["jobs"] is not None:
+                    stop_event_hooks()  # Hooks were subscribed with the old connection
+                stop_poller()
                 client = None
                 print("Disconnected from Transmission.")
             
             elif cmd == "clear":
                 clear_screen()
                             
+            elif cmd == "rssrules":
+                if len(command) > 1 and command[1] == "bench":
+                    benchmark_rss_rules(int(command[2]) if len(command) > 2 else 3000)
+                else:
+                    show_rss_rule_hits()
+
             elif cmd == "exit":
+                if _hooks["jobs"] is not None:
+                    stop_event_hooks()
+                stop_poller()
                 save_command_history()
                 print("Exiting Transmission Shell.")
                 break
@@ -615,13 +1526,17 @@ def main():
                 print("  watch                         - Auto-refresh torrent status")
                 print("  add <url> [dir] [paused]      - Add a new torrent with optional download directory")
                 print("  adddir <dir> [dir] [paused]   - Add all torrents from a directory")
+                print("  watchdir <dir> [dir] [paused] - Watch a directory and add new torrents as they land")
                 print("  massadd <file> [dir] [paused] - Add a torrent magnets from a file")
                 print("  exportmagnets [file]          - Export paused torrents to a file, then remove.")
                 print("  rssfetch                      - Fetch new torrents from RSS feeds")
                 print("  rssauto [secs]                - Automatically fetch RSS torrents (default: 900 sec)")
+                print("  rssrules [bench [n]]          - Show RSS rule hit counts, or benchmark n rules")
                 print("  remove <id>                   - Remove a torrent by ID")
                 print("  removecompleted               - Remove all completed torrents")
                 print("  autoresume [secs] [stall_min] - Auto-restart stalled torrents")
+                print("  bwauto [secs]                 - Auto-tune queue size and speed limits (default: 60 sec)")
+                print("  hooks [on|off]                - Run event hooks in the background (default: on)")
                 print("  start <id>                    - Start a torrent")
                 print("  forcestart <id>               - Start a torrent, skipping the queue")                
                 print("  stop <id>                     - Stop a torrent")
@@ -674,6 +1589,13 @@ def main():
                     add_torrents_from_directory(client, command[1], download_dir, paused)
                 else:
                     print("usage: adddir <dir> [dir] [paused]")
+
+            elif cmd == "watchdir":
+                if len(command) > 1:
+                    download_dir = command[2] if len(command) > 2 and command[2] != "paused" else None
+                    watch_torrent_directory(client, command[1], download_dir, paused)
+                else:
+                    print("usage: watchdir <dir> [dir] [paused]")
                     
             elif cmd == "massadd" or cmd == "importmagnets":
                 if len(command) > 1:
@@ -733,6 +1655,16 @@ def main():
                 interval = int(command[1]) if len(command) > 1 else 900
                 stall_threshold = int(command[2]) if len(command) > 2 else 10
                 auto_resume_stalled(client, interval, stall_threshold)
+
+            elif cmd == "hooks":
+                if len(command) > 1 and command[1] == "off":
+                    stop_event_hooks()
+                else:
+                    start_event_hooks(client)
+
+            elif cmd == "bwauto":
+                interval = int(command[1]) if len(command) > 1 else 60
+                auto_tune_bandwidth(client, interval)
             
             else:
                 print("Unknown command '" + cmd + "'.\nType 'help' for a list of commands.")